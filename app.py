@@ -1,218 +1,427 @@
-import streamlit as st
-import easyocr
-import cv2
-import numpy as np
-import sqlite3
-import pandas as pd
-
-# --- 1. 初始化設定 ---
-st.set_page_config(page_title="車牌辨識與人員管理系統", layout="centered")
-
-@st.cache_resource
-def load_reader():
-    return easyocr.Reader(['en'])
-
-reader = load_reader()
-
-# --- 2. 資料庫功能 (SQLite) ---
-DB_FILE = "lpr_system.db"
-
-def init_db():
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS plates (
-            plate_number TEXT PRIMARY KEY,
-            owner_name TEXT,
-            department TEXT
-        )
-    ''')
-    conn.commit()
-    conn.close()
-
-def clean_plate_text(text):
-    """統一將車牌轉大寫並移除符號，方便比對"""
-    return text.replace("-", "").replace(" ", "").upper()
-
-def add_plate(plate, name, dept):
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    plate_clean = clean_plate_text(plate)
-    try:
-        c.execute("INSERT INTO plates (plate_number, owner_name, department) VALUES (?, ?, ?)", 
-                  (plate_clean, name, dept))
-        conn.commit()
-        return True, f"成功新增: {plate_clean}"
-    except sqlite3.IntegrityError:
-        return False, f"車牌已存在: {plate_clean}"
-    finally:
-        conn.close()
-
-def delete_plate(plate):
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute("DELETE FROM plates WHERE plate_number = ?", (plate,))
-    conn.commit()
-    conn.close()
-
-def get_owner(plate_text):
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    plate_clean = clean_plate_text(plate_text)
-    c.execute("SELECT owner_name, department FROM plates WHERE plate_number = ?", (plate_clean,))
-    result = c.fetchone()
-    conn.close()
-    return result
-
-def load_data():
-    conn = sqlite3.connect(DB_FILE)
-    df = pd.read_sql_query("SELECT * FROM plates", conn)
-    conn.close()
-    return df
-
-# 初始化 DB
-init_db()
-
-# --- 3. 圖像處理與辨識功能 ---
-def recognize_plate(image_bytes):
-    file_bytes = np.asarray(bytearray(image_bytes.read()), dtype=np.uint8)
-    img = cv2.imdecode(file_bytes, 1)
-    results = reader.readtext(img)
-    
-    detected_text = []
-    for (bbox, text, prob) in results:
-        # 過濾邏輯：長度大於3且信心度大於0.3
-        cleaned = clean_plate_text(text)
-        if len(cleaned) >= 3 and prob > 0.3:
-            detected_text.append(cleaned)
-            
-    return detected_text
-
-# --- 4. 介面設計 (UI) ---
-
-st.title("🚗 智慧車牌辨識系統")
-menu = st.sidebar.selectbox("選單", ["📸 車牌辨識 (前台)", "⚙️ 後台管理"])
-
-# ================= ⚙️ 後台管理區塊 =================
-if menu == "⚙️ 後台管理":
-    st.header("資料庫管理")
-    tab1, tab2, tab3 = st.tabs(["➕ 單筆新增", "📂 CSV 批次匯入", "📃 資料列表"])
-
-    with tab1:
-        st.subheader("單筆新增車牌")
-        with st.form("add_form"):
-            new_plate = st.text_input("車牌號碼")
-            new_name = st.text_input("人員姓名")
-            new_dept = st.text_input("部門/職稱")
-            submit = st.form_submit_button("新增")
-            if submit:
-                if new_plate and new_name:
-                    success, msg = add_plate(new_plate, new_name, new_dept)
-                    if success:
-                        st.success(msg)
-                    else:
-                        st.error(msg)
-                else:
-                    st.error("請填寫完整資訊")
-
-    with tab2:
-        st.subheader("批次匯入資料")
-        st.markdown("支援 UTF-8 與 Excel (Big5) 格式 CSV。")
-        uploaded_file = st.file_uploader("選擇 CSV 檔案", type=['csv'])
-        
-        if uploaded_file is not None:
-            try:
-                # 嘗試讀取 (自動偵測編碼)
-                try:
-                    df_upload = pd.read_csv(uploaded_file)
-                except UnicodeDecodeError:
-                    uploaded_file.seek(0)
-                    df_upload = pd.read_csv(uploaded_file, encoding='big5')
-
-                # 檢查欄位
-                required_cols = {'車牌', '姓名', '部門'}
-                if not required_cols.issubset(df_upload.columns):
-                    st.error(f"欄位名稱錯誤！請確認 CSV 包含: {required_cols}")
-                else:
-                    st.write(f"預覽前 3 筆資料:")
-                    st.dataframe(df_upload.head(3))
-                    
-                    if st.button("確認匯入資料庫"):
-                        success_count = 0
-                        fail_count = 0
-                        progress_bar = st.progress(0)
-                        
-                        for index, row in df_upload.iterrows():
-                            s, m = add_plate(str(row['車牌']), str(row['姓名']), str(row['部門']))
-                            if s: success_count += 1
-                            else: fail_count += 1
-                            progress_bar.progress((index + 1) / len(df_upload))
-                            
-                        st.success(f"匯入完成！成功: {success_count}，重複/失敗: {fail_count}")
-
-            except Exception as e:
-                st.error(f"讀取失敗: {e}")
-
-    with tab3:
-        st.subheader("現有資料")
-        df = load_data()
-        st.dataframe(df, use_container_width=True)
-        
-        st.divider()
-        del_plate = st.selectbox("選擇要刪除的車牌", df['plate_number'].unique() if not df.empty else [])
-        if st.button("刪除") and del_plate:
-            delete_plate(del_plate)
-            st.rerun()
-
-# ================= 📸 前台辨識區塊 (更新！) =================
-elif menu == "📸 車牌辨識 (前台)":
-    
-    # 1. 拍照辨識
-    st.subheader("📷 拍照辨識")
-    img_file = st.camera_input("點擊拍攝")
-
-    if img_file is not None:
-        st.write("🔄 影像處理中...")
-        candidates = recognize_plate(img_file)
-        
-        if not candidates:
-            st.error("❌ 畫面中未偵測到文字")
-        else:
-            found = False
-            for text in candidates:
-                owner = get_owner(text)
-                if owner:
-                    st.success(f"✅ 辨識成功！車牌: {text}")
-                    st.info(f"👤 姓名: {owner[0]}")
-                    st.info(f"🏢 部門: {owner[1]}")
-                    found = True
-                    break
-            if not found:
-                st.warning(f"⚠️ 辨識出: {candidates}，但資料庫無此車牌。")
-
-    st.divider() # 分隔線
-
-    # 2. 手動查詢 (新增功能)
-    st.subheader("🔍 手動輸入查詢")
-    
-    with st.form("manual_lookup"):
-        # 使用 column 讓按鈕排在輸入框旁邊
-        col1, col2 = st.columns([3, 1])
-        with col1:
-            manual_input = st.text_input("輸入車牌號碼", placeholder="例如: ABC-1234")
-        with col2:
-            st.write("") # 排版用空格
-            st.write("")
-            manual_submit = st.form_submit_button("查詢")
-
-    if manual_submit:
-        if manual_input:
-            owner = get_owner(manual_input)
-            if owner:
-                st.success(f"✅ 查詢成功！車牌: {manual_input.upper()}")
-                st.info(f"👤 姓名: {owner[0]}")
-                st.info(f"🏢 部門: {owner[1]}")
-            else:
-                st.error(f"❌ 查無此車牌資料: {manual_input}")
-        else:
+import os
+import re
+
+# 要在 torch 被載入前先鎖定 BLAS/OpenMP 執行緒數，避免多 session 時 oversubscription
+os.environ.setdefault("OMP_NUM_THREADS", str(os.cpu_count()))
+os.environ.setdefault("MKL_NUM_THREADS", str(os.cpu_count()))
+
+# easyocr (連帶 torch) 與 cv2 改成延遲載入：只有真的走到相機路徑才 import，
+# 後台分頁的 rerun 不用付數百 ms 的載入成本
+import streamlit as st
+import numpy as np
+import sqlite3
+import pandas as pd
+
+# --- 1. 初始化設定 ---
+st.set_page_config(page_title="車牌辨識與人員管理系統", layout="centered")
+
+@st.cache_resource
+def load_reader():
+    # 優先使用 ONNX Runtime 管線 (CPU 上約 3~6 倍快)，
+    # 沒裝 onnxruntime 或還沒匯出模型時退回 EasyOCR
+    try:
+        from onnx_ocr import OnnxReader
+        return OnnxReader()
+    except (ImportError, FileNotFoundError):
+        import easyocr
+        import torch
+        torch.set_num_threads(os.cpu_count())
+        torch.set_grad_enabled(False)  # 純推論，不需要 autograd
+        r = easyocr.Reader(['en'])
+        # 先跑一張小圖暖機，讓 oneDNN/cuDNN 核心初始化不算在第一位使用者頭上
+        r.readtext(np.zeros((64, 128, 3), dtype=np.uint8))
+        return r
+
+def run_ocr(img, **kwargs):
+    """統一的 readtext 進入點；EasyOCR 路徑包進 inference_mode 省掉 autograd 簿記"""
+    reader = load_reader()  # cache_resource，實際只建一次
+    if reader.__module__.startswith('easyocr'):
+        import torch
+        with torch.inference_mode():
+            return reader.readtext(img, **kwargs)
+    return reader.readtext(img, **kwargs)
+
+@st.cache_resource
+def load_jpeg_decoder():
+    # libjpeg-turbo 解 JPEG 約比 cv2.imdecode 快 2 倍；沒裝時回 None 改走 OpenCV
+    try:
+        from turbojpeg import TurboJPEG
+        return TurboJPEG()
+    except (ImportError, OSError):
+        return None
+
+# --- 2. 資料庫功能 (SQLite) ---
+DB_FILE = "lpr_system.db"
+CSV_CHUNK_ROWS = 5000  # CSV 匯入每塊的列數
+
+@st.cache_resource
+def get_conn():
+    """共用單一長連線，避免每次查詢都重新 connect"""
+    # 不開 autocommit：保留隱式交易，讓 with conn: 區塊真的包成一個交易
+    conn = sqlite3.connect(DB_FILE, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA cache_size=-20000")  # 20MB page cache，整張表常駐記憶體
+    conn.execute("PRAGMA case_sensitive_like=OFF")
+    return conn
+
+# 模組層常數：每個呼叫點重用同一條 SQL 字串，吃 SQLite 內建的 statement cache
+SELECT_OWNER_SQL = "SELECT owner_name, department FROM plates WHERE plate_number = ?"
+
+def init_db():
+    conn = get_conn()
+    with conn:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS plates (
+                plate_number TEXT PRIMARY KEY COLLATE NOCASE,
+                owner_name TEXT,
+                department TEXT
+            )
+        ''')
+
+_STRIP = str.maketrans('', '', '- \t\n')  # 要移除的符號對照表
+PLATE_RE = re.compile(r'^[A-Z0-9]{3,8}$')  # 清洗後的合法車牌格式
+
+def clean_plate_text(text):
+    """統一將車牌轉大寫並移除符號，方便比對 (translate 一趟取代三趟 replace)"""
+    return text.translate(_STRIP).upper()
+
+def add_plate(plate, name, dept):
+    conn = get_conn()
+    plate_clean = clean_plate_text(plate)
+    with conn:
+        # OR IGNORE + rowcount 判斷重複，省掉 IntegrityError 的例外展開成本
+        cur = conn.execute("INSERT OR IGNORE INTO plates (plate_number, owner_name, department) VALUES (?, ?, ?)",
+                           (plate_clean, name, dept))
+    if cur.rowcount != 1:
+        return False, f"車牌已存在: {plate_clean}"
+    load_data.clear()
+    plate_index.clear()
+    list_plate_numbers.clear()
+    return True, f"成功新增: {plate_clean}"
+
+def delete_plate(plate):
+    conn = get_conn()
+    with conn:
+        conn.execute("DELETE FROM plates WHERE plate_number = ?", (plate,))
+    load_data.clear()
+    plate_index.clear()
+    list_plate_numbers.clear()
+
+def get_owner(plate_text):
+    conn = get_conn()
+    plate_clean = clean_plate_text(plate_text)
+    c = conn.execute(SELECT_OWNER_SQL, (plate_clean,))
+    return c.fetchone()
+
+PLATE_INDEX_LIMIT = 500_000  # 超過就別整張搬進記憶體，退回 SQL 批次查詢
+
+@st.cache_resource
+def plate_index():
+    """整張 plates 表載入成 dict，前台查詢變成 O(1) 雜湊查找；表太大時回 None"""
+    conn = get_conn()
+    count = conn.execute("SELECT COUNT(*) FROM plates").fetchone()[0]
+    if count >= PLATE_INDEX_LIMIT:
+        return None
+    return {p: (n, d) for p, n, d in
+            conn.execute("SELECT plate_number, owner_name, department FROM plates")}
+
+def get_owners_bulk(plates):
+    """一次查多個車牌 (OCR 候選清單)，回傳 {車牌: (姓名, 部門)}。傳入值須已清洗過。"""
+    if not plates:
+        return {}
+    conn = get_conn()
+    placeholders = ','.join('?' * len(plates))
+    rows = conn.execute(
+        f"SELECT plate_number, owner_name, department FROM plates WHERE plate_number IN ({placeholders})",
+        plates).fetchall()
+    return {r[0]: (r[1], r[2]) for r in rows}
+
+def add_plates_bulk(df):
+    """批次寫入車牌資料：單一連線 + executemany + 單一交易，避免逐筆 commit 的開銷
+
+    回傳 (成功數, 重複數, 格式不符數)。欄位須已是字串 (read_csv 時給 dtype=str)。
+    """
+    df = df.fillna('')
+    # str.translate 一趟 C 迴圈處理整欄，比逐列 apply(clean_plate_text) 快一個量級
+    clean_series = df['車牌'].str.translate(_STRIP).str.upper()
+    # 格式驗證也整欄做一次，不逐列跑 Python
+    mask = clean_series.str.match(PLATE_RE)
+    invalid_count = int((~mask).sum())
+    rows = list(zip(clean_series[mask], df['姓名'][mask], df['部門'][mask]))
+    conn = get_conn()
+    with conn:  # 整批包在同一個交易裡，只 fsync 一次
+        cur = conn.executemany(
+            "INSERT OR IGNORE INTO plates (plate_number, owner_name, department) VALUES (?, ?, ?)",
+            rows)
+    load_data.clear()
+    plate_index.clear()
+    list_plate_numbers.clear()
+    success_count = cur.rowcount
+    return success_count, len(rows) - success_count, invalid_count
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_data():
+    # Streamlit 每次互動都重跑腳本，整張表的查詢結果快取 5 分鐘，寫入時主動失效
+    conn = get_conn()
+    return pd.read_sql_query("SELECT * FROM plates", conn)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def list_plate_numbers():
+    # 刪除下拉選單只需要 key 欄位，不必整張表搬成 DataFrame 再 unique()
+    return [r[0] for r in get_conn().execute("SELECT plate_number FROM plates ORDER BY plate_number")]
+
+# 初始化 DB
+init_db()
+
+# --- 3. 圖像處理與辨識功能 ---
+MAX_OCR_EDGE = 1280  # 偵測器耗時跟像素數成正比，手機照片先縮到這個上限
+
+try:
+    from numba import njit, prange
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+if _HAS_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _binarize_kernel(gray, out, radius, offset):
+        """區域均值 + 二值化融合成單一核心：滑動視窗維護區域和，整張圖只掃一趟"""
+        h, w = gray.shape
+        for y in prange(h):
+            y0 = max(0, y - radius)
+            y1 = min(h, y + radius + 1)
+            win_sum = 0.0
+            win_cnt = 0
+            for xx in range(min(w, radius + 1)):
+                for yy in range(y0, y1):
+                    win_sum += gray[yy, xx]
+                win_cnt += y1 - y0
+            for x in range(w):
+                if gray[y, x] > win_sum / win_cnt - offset:
+                    out[y, x] = 255
+                else:
+                    out[y, x] = 0
+                add = x + radius + 1
+                if add < w:
+                    for yy in range(y0, y1):
+                        win_sum += gray[yy, add]
+                    win_cnt += y1 - y0
+                rem = x - radius
+                if rem >= 0:
+                    for yy in range(y0, y1):
+                        win_sum -= gray[yy, rem]
+                    win_cnt -= y1 - y0
+
+def preprocess_plate(gray):
+    """對比強化 + 自適應二值化，讓車牌字元更好認"""
+    if not _HAS_NUMBA:
+        # 沒裝 numba 時退回 OpenCV 的多趟版本
+        import cv2
+        return cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_MEAN_C,
+                                     cv2.THRESH_BINARY, 31, 10)
+    # 每次呼叫配一塊輸出緩衝：成本相對 OCR 可忽略，
+    # 共用緩衝會讓多個 session 同時辨識時互相覆寫
+    out = np.empty_like(gray)
+    _binarize_kernel(gray, out, 15, 10.0)
+    return out
+
+def recognize_plate(image_bytes, **ocr_kwargs):
+    import cv2
+    cv2.setNumThreads(os.cpu_count())
+    data = image_bytes.getvalue()  # BytesIO 直接拿 bytes，不必 read() + bytearray
+    jpeg = load_jpeg_decoder()
+    if jpeg is not None and data[:2] == b'\xff\xd8':  # turbojpeg 只吃 JPEG
+        from turbojpeg import TJPF_BGR
+        img = jpeg.decode(data, pixel_format=TJPF_BGR)
+    else:
+        # frombuffer 是 bytes 上的唯讀 view，不像 bytearray+asarray 要複製兩次
+        img = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+    # 縮圖 + 灰階：餵給 OCR 的 bytes 越少越快
+    scale = MAX_OCR_EDGE / max(img.shape[:2])
+    if scale < 1:
+        img = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    gray = preprocess_plate(gray)
+    img = cv2.merge([gray, gray, gray])  # 模型吃 3 通道，疊回去
+
+    results = run_ocr(img, **ocr_kwargs)
+    
+    detected_text = []
+    for (bbox, text, prob) in results:
+        # 過濾邏輯：長度大於3且信心度大於0.3
+        cleaned = clean_plate_text(text)
+        if len(cleaned) >= 3 and prob > 0.3:
+            detected_text.append(cleaned)
+            
+    return detected_text
+
+# --- 4. 介面設計 (UI) ---
+
+st.title("🚗 智慧車牌辨識系統")
+menu = st.sidebar.selectbox("選單", ["📸 車牌辨識 (前台)", "⚙️ 後台管理"])
+
+# ================= ⚙️ 後台管理區塊 =================
+if menu == "⚙️ 後台管理":
+    st.header("資料庫管理")
+    tab1, tab2, tab3 = st.tabs(["➕ 單筆新增", "📂 CSV 批次匯入", "📃 資料列表"])
+
+    with tab1:
+        st.subheader("單筆新增車牌")
+        with st.form("add_form"):
+            new_plate = st.text_input("車牌號碼")
+            new_name = st.text_input("人員姓名")
+            new_dept = st.text_input("部門/職稱")
+            submit = st.form_submit_button("新增")
+            if submit:
+                if new_plate and new_name:
+                    success, msg = add_plate(new_plate, new_name, new_dept)
+                    if success:
+                        st.success(msg)
+                    else:
+                        st.error(msg)
+                else:
+                    st.error("請填寫完整資訊")
+
+    with tab2:
+        st.subheader("批次匯入資料")
+        st.markdown("支援 UTF-8 與 Excel (Big5) 格式 CSV。")
+        uploaded_file = st.file_uploader("選擇 CSV 檔案", type=['csv'])
+        
+        if uploaded_file is not None:
+            try:
+                # 嘗試讀取前幾筆做預覽 (自動偵測編碼)
+                encoding = 'utf-8'
+                try:
+                    preview = pd.read_csv(uploaded_file, nrows=3)
+                except UnicodeDecodeError:
+                    encoding = 'big5'
+                    uploaded_file.seek(0)
+                    preview = pd.read_csv(uploaded_file, nrows=3, encoding='big5')
+
+                # 檢查欄位 (只看第一塊即可)
+                required_cols = {'車牌', '姓名', '部門'}
+                if not required_cols.issubset(preview.columns):
+                    st.error(f"欄位名稱錯誤！請確認 CSV 包含: {required_cols}")
+                else:
+                    st.write(f"預覽前 3 筆資料:")
+                    st.dataframe(preview)
+
+                    if st.button("確認匯入資料庫"):
+                        success_count = 0
+                        fail_count = 0
+                        invalid_count = 0
+                        progress_bar = st.progress(0)
+
+                        # 以換行數估總列數 (扣標題列)，進度條用
+                        total_rows = max(1, uploaded_file.getvalue().count(b'\n') - 1)
+                        uploaded_file.seek(0)
+                        done = 0
+                        # 分塊讀取 + 分塊寫入：記憶體用量跟 CSV 大小無關。
+                        # 進度條只在塊邊界更新，每次更新都是一趟 websocket 往返
+                        with st.spinner("匯入中..."):
+                            for chunk in pd.read_csv(uploaded_file, encoding=encoding,
+                                                     chunksize=CSV_CHUNK_ROWS,
+                                                     dtype={'車牌': str, '姓名': str, '部門': str}):
+                                s, f, inv = add_plates_bulk(chunk)
+                                success_count += s
+                                fail_count += f
+                                invalid_count += inv
+                                done += len(chunk)
+                                progress_bar.progress(min(1.0, done / total_rows))
+                        progress_bar.progress(1.0)  # 估算值可能略大，收尾補滿
+
+                        st.success(f"匯入完成！成功: {success_count}，重複: {fail_count}，格式不符: {invalid_count}")
+
+            except Exception as e:
+                st.error(f"讀取失敗: {e}")
+
+    with tab3:
+        st.subheader("現有資料")
+        df = load_data()
+        st.dataframe(df, use_container_width=True)
+        
+        st.divider()
+        del_plate = st.selectbox("選擇要刪除的車牌", list_plate_numbers())
+        if st.button("刪除") and del_plate:
+            delete_plate(del_plate)
+            st.rerun()
+
+# ================= 📸 前台辨識區塊 (更新！) =================
+elif menu == "📸 車牌辨識 (前台)":
+    
+    # 1. 拍照辨識
+    st.subheader("📷 拍照辨識")
+    img_file = st.camera_input("點擊拍攝")
+
+    if img_file is not None:
+        st.write("🔄 影像處理中...")
+        candidates = recognize_plate(img_file)
+        
+        if not candidates:
+            st.error("❌ 畫面中未偵測到文字")
+        else:
+            # candidates 在 recognize_plate 內已清洗過；小表直接打記憶體索引，
+            # 超過上限才退回 SQL 批次查詢
+            idx = plate_index()
+            hits = idx if idx is not None else get_owners_bulk(candidates)
+            found = False
+            for text in candidates:
+                if text in hits:
+                    owner = hits[text]
+                    st.success(f"✅ 辨識成功！車牌: {text}")
+                    st.info(f"👤 姓名: {owner[0]}")
+                    st.info(f"🏢 部門: {owner[1]}")
+                    found = True
+                    break
+            if not found:
+                st.warning(f"⚠️ 辨識出: {candidates}，但資料庫無此車牌。")
+
+    st.divider() # 分隔線
+
+    # 2. 批次辨識 (一次上傳多張照片)
+    st.subheader("🖼️ 批次辨識")
+    batch_files = st.file_uploader("上傳多張車輛照片", type=['jpg', 'jpeg', 'png'],
+                                   accept_multiple_files=True)
+    if batch_files:
+        idx = plate_index()
+        for f in batch_files:
+            # batch_size>1 讓辨識器把同張圖的文字框疊成一個批次跑，攤提每次呼叫的固定開銷
+            batch_candidates = recognize_plate(f, batch_size=8)
+            hits = idx if idx is not None else get_owners_bulk(batch_candidates)
+            match = next((t for t in batch_candidates if t in hits), None)
+            if match:
+                owner = hits[match]
+                st.success(f"📄 {f.name} → {match}：{owner[0]} ({owner[1]})")
+            elif batch_candidates:
+                st.warning(f"📄 {f.name} → 辨識出 {batch_candidates}，資料庫無符合車牌")
+            else:
+                st.error(f"📄 {f.name} → 未偵測到文字")
+
+    st.divider()
+
+    # 3. 手動查詢 (新增功能)
+    st.subheader("🔍 手動輸入查詢")
+    
+    with st.form("manual_lookup"):
+        # 使用 column 讓按鈕排在輸入框旁邊
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            manual_input = st.text_input("輸入車牌號碼", placeholder="例如: ABC-1234")
+        with col2:
+            st.write("") # 排版用空格
+            st.write("")
+            manual_submit = st.form_submit_button("查詢")
+
+    if manual_submit:
+        if manual_input:
+            owner = get_owner(manual_input)
+            if owner:
+                st.success(f"✅ 查詢成功！車牌: {manual_input.upper()}")
+                st.info(f"👤 姓名: {owner[0]}")
+                st.info(f"🏢 部門: {owner[1]}")
+            else:
+                st.error(f"❌ 查無此車牌資料: {manual_input}")
+        else:
             st.warning("請輸入車牌號碼")
\ No newline at end of file
@@ -0,0 +1,184 @@
+"""ONNX Runtime 版車牌 OCR 管線 (CRAFT 偵測 + CRNN 辨識)。
+
+模型需先用 JaidedAI 提供的腳本把 EasyOCR 的 detector / recognizer 匯出成
+ONNX，放在 models/ 目錄下。介面刻意與 easyocr.Reader.readtext 相容：
+回傳 (bbox, text, prob) 的 list，app.py 的過濾邏輯不用改。
+"""
+import os
+
+import cv2
+import numpy as np
+import onnxruntime as ort
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+DETECTOR_PATH = os.path.join(MODEL_DIR, "craft.onnx")
+RECOGNIZER_PATH = os.path.join(MODEL_DIR, "english_g2.onnx")
+
+# english_g2 的字元表，index 0 保留給 CTC blank
+CHARSET = ("0123456789!\"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~ "
+           "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ")
+
+# CRAFT 的 ImageNet 正規化參數
+_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+
+_REC_HEIGHT = 64   # CRNN 輸入高度
+_REC_MAX_WIDTH = 256
+
+
+def _make_session(path):
+    opts = ort.SessionOptions()
+    opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    opts.intra_op_num_threads = os.cpu_count()
+    available = ort.get_available_providers()
+    providers = []
+    if 'OpenVINOExecutionProvider' in available:
+        providers.append('OpenVINOExecutionProvider')
+    providers.append(('CPUExecutionProvider', {'enable_cpu_mem_arena': True}))
+    return ort.InferenceSession(path, sess_options=opts, providers=providers)
+
+
+def _quantize_detector(fp32_path):
+    """偵測器 (conv 為主) 轉 FP16，權重頻寬減半。失敗就用原模型。"""
+    fp16_path = fp32_path.replace(".onnx", ".fp16.onnx")
+    if os.path.exists(fp16_path):
+        return fp16_path
+    try:
+        import onnx
+        from onnxconverter_common import float16
+        model = onnx.load(fp32_path)
+        onnx.save(float16.convert_float_to_float16(model), fp16_path)
+        return fp16_path
+    except Exception:
+        return fp32_path
+
+
+def _quantize_recognizer(fp32_path):
+    """辨識器 (RNN/Linear 為主) 做 dynamic INT8，吃 VNNI 的 int8 點積"""
+    int8_path = fp32_path.replace(".onnx", ".int8.onnx")
+    if os.path.exists(int8_path):
+        return int8_path
+    try:
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QUInt8)
+        return int8_path
+    except Exception:
+        return fp32_path
+
+
+class OnnxReader:
+    """以 ONNX Runtime 跑 CRAFT+CRNN，介面相容 easyocr.Reader"""
+
+    def __init__(self, detector_path=DETECTOR_PATH, recognizer_path=RECOGNIZER_PATH):
+        if not (os.path.exists(detector_path) and os.path.exists(recognizer_path)):
+            raise FileNotFoundError(f"找不到 ONNX 模型，請先匯出至 {MODEL_DIR}")
+        self.detector = _make_session(_quantize_detector(detector_path))
+        self.recognizer = _make_session(_quantize_recognizer(recognizer_path))
+        self._det_input = self.detector.get_inputs()[0].name
+        self._rec_input = self.recognizer.get_inputs()[0].name
+        # FP16 模型吃 float16 輸入
+        det_type = self.detector.get_inputs()[0].type
+        self._det_dtype = np.float16 if det_type == 'tensor(float16)' else np.float32
+
+    # ---- 偵測 ----
+    def _detect_boxes(self, img, canvas=1280, text_thresh=0.5, box_thresh=0.4):
+        h, w = img.shape[:2]
+        ratio = min(1.0, canvas / max(h, w))
+        tw, th = int(w * ratio), int(h * ratio)
+        # CRAFT 要求邊長為 32 的倍數，不足的部分補零
+        pw, ph = (tw + 31) // 32 * 32, (th + 31) // 32 * 32
+        resized = cv2.resize(img, (tw, th))
+        padded = np.zeros((ph, pw, 3), dtype=np.float32)
+        padded[:th, :tw] = resized
+        x = (padded / 255.0 - _MEAN) / _STD
+        x = x.transpose(2, 0, 1)[np.newaxis].astype(self._det_dtype)
+
+        y = self.detector.run(None, {self._det_input: x})[0][0].astype(np.float32)
+        score_text = y[:, :, 0]
+        score_link = y[:, :, 1]
+
+        # 文字 + 連結分數疊加後取連通區域
+        binary = ((score_text > text_thresh) | (score_link > box_thresh)).astype(np.uint8)
+        n_labels, labels, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=4)
+        boxes = []
+        for i in range(1, n_labels):
+            if stats[i, cv2.CC_STAT_AREA] < 10:
+                continue
+            if score_text[labels == i].max() < text_thresh:
+                continue
+            pts = cv2.findNonZero((labels == i).astype(np.uint8))
+            rect = cv2.minAreaRect(pts)
+            box = cv2.boxPoints(rect)
+            # score map 是輸入的一半解析度，再除回縮放比例
+            box = box * 2.0 / ratio
+            boxes.append(np.clip(box, 0, [w - 1, h - 1]).astype(np.float32))
+        return boxes
+
+    # ---- 切出文字區塊 ----
+    @staticmethod
+    def _crop(img, box):
+        box = OnnxReader._order_points(box)
+        bw = int(max(np.linalg.norm(box[0] - box[1]), np.linalg.norm(box[2] - box[3])))
+        bh = int(max(np.linalg.norm(box[0] - box[3]), np.linalg.norm(box[1] - box[2])))
+        if bw < 2 or bh < 2:
+            return None
+        dst = np.array([[0, 0], [bw - 1, 0], [bw - 1, bh - 1], [0, bh - 1]], dtype=np.float32)
+        m = cv2.getPerspectiveTransform(box, dst)
+        return cv2.warpPerspective(img, m, (bw, bh))
+
+    @staticmethod
+    def _order_points(box):
+        """依 左上/右上/右下/左下 排序四個角點"""
+        s = box.sum(axis=1)
+        d = np.diff(box, axis=1).ravel()
+        return np.array([box[np.argmin(s)], box[np.argmin(d)],
+                         box[np.argmax(s)], box[np.argmax(d)]], dtype=np.float32)
+
+    # ---- 辨識 ----
+    def _recognize_batch(self, crops):
+        grays = []
+        for crop in crops:
+            g = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if crop.ndim == 3 else crop
+            scale = _REC_HEIGHT / g.shape[0]
+            tw = min(_REC_MAX_WIDTH, max(8, int(g.shape[1] * scale)))
+            grays.append(cv2.resize(g, (tw, _REC_HEIGHT)))
+        max_w = max(g.shape[1] for g in grays)
+        batch = np.zeros((len(grays), 1, _REC_HEIGHT, max_w), dtype=np.float32)
+        for i, g in enumerate(grays):
+            batch[i, 0, :, :g.shape[1]] = (g.astype(np.float32) / 255.0 - 0.5) / 0.5
+
+        logits = self.recognizer.run(None, {self._rec_input: batch})[0]
+        return [self._ctc_decode(logits[i]) for i in range(len(grays))]
+
+    @staticmethod
+    def _ctc_decode(logits):
+        """貪婪 CTC 解碼：合併重複、去掉 blank(0)，信心度取保留步的 softmax 平均"""
+        exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+        probs = exp / exp.sum(axis=-1, keepdims=True)
+        ids = probs.argmax(axis=-1)
+        chars, confs = [], []
+        prev = 0
+        for t, idx in enumerate(ids):
+            if idx != 0 and idx != prev and idx - 1 < len(CHARSET):
+                chars.append(CHARSET[idx - 1])
+                confs.append(probs[t, idx])
+            prev = idx
+        text = ''.join(chars)
+        prob = float(np.mean(confs)) if confs else 0.0
+        return text, prob
+
+    # ---- 對外介面 ----
+    def readtext(self, img, **kwargs):
+        boxes = self._detect_boxes(img)
+        if not boxes:
+            return []
+        crops, kept_boxes = [], []
+        for box in boxes:
+            crop = self._crop(img, box)
+            if crop is not None:
+                crops.append(crop)
+                kept_boxes.append(box.tolist())
+        if not crops:
+            return []
+        decoded = self._recognize_batch(crops)
+        return [(box, text, prob) for box, (text, prob) in zip(kept_boxes, decoded)]